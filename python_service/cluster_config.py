@@ -1,6 +1,7 @@
 """
 Cluster behavioral profiles derived from federated learning analysis.
 Each cluster exhibits distinct power output, volatility, downtime, and ramp characteristics.
+Also holds the geographic layout used by generate_turbines.py.
 """
 
 # Cluster characteristics from analysis.md - behavior profiles for each cluster
@@ -54,3 +55,51 @@ CLUSTER_PROFILES = {
         "description": "Frequent ramp-ups, mildly unstable"
     }
 }
+
+
+# Turbine counts and sampling zones per cluster for generate_turbines.py.
+# zone is (lon_min, lon_max, lat_min, lat_max); min_dist is in degrees.
+CLUSTER_LAYOUT = {
+    0: {
+        "count": 49,
+        "name": "Zealand North",
+        "zone": (11.78, 12.67, 55.78, 56.20),
+        "min_dist": 0.018,
+    },
+    1: {
+        "count": 12,
+        "name": "Zealand Northeast",
+        "zone": (12.35, 12.80, 55.72, 56.03),
+        "min_dist": 0.03,
+    },
+    2: {
+        "count": 4,
+        "name": "Zealand East",
+        "zone": (12.18, 12.65, 55.43, 55.73),
+        "min_dist": 0.04,
+    },
+    3: {
+        "count": 246,
+        "name": "Zealand Central",
+        "zone": (11.45, 12.60, 55.08, 55.86),
+        "min_dist": 0.012,
+    },
+    4: {
+        "count": 74,
+        "name": "Zealand West",
+        "zone": (11.20, 11.95, 55.20, 55.95),
+        "min_dist": 0.017,
+    },
+    5: {
+        "count": 6,
+        "name": "Zealand Southwest",
+        "zone": (11.60, 12.05, 54.95, 55.30),
+        "min_dist": 0.035,
+    },
+    6: {
+        "count": 9,
+        "name": "Zealand South",
+        "zone": (11.78, 12.35, 54.88, 55.20),
+        "min_dist": 0.03,
+    },
+}
@@ -1,72 +1,17 @@
-import json
+import math
 import os
-import random
 from datetime import datetime
 
+import numpy as np
+import orjson
 
-def point_in_polygon(lon, lat, polygon):
-    """Ray-casting point-in-polygon test."""
-    inside = False
-    n = len(polygon)
-    j = n - 1
-    for i in range(n):
-        xi, yi = polygon[i]
-        xj, yj = polygon[j]
-        intersects = ((yi > lat) != (yj > lat)) and (
-            lon < (xj - xi) * (lat - yi) / ((yj - yi) + 1e-12) + xi
-        )
-        if intersects:
-            inside = not inside
-        j = i
-    return inside
-
-
-def sample_distributed_points(count, island_polygon, zone_bbox, min_dist):
-    """
-    Sample points with minimum spacing inside a cluster zone and island polygon.
-    Falls back by gradually reducing min_dist if requested count is hard to fit.
-    """
-    lon_min, lon_max, lat_min, lat_max = zone_bbox
-    points = []
-    current_min_dist = min_dist
-
-    while len(points) < count:
-        added_before = len(points)
-
-        for _ in range(12000):
-            lat = random.uniform(lat_min, lat_max)
-            lon = random.uniform(lon_min, lon_max)
-
-            if not point_in_polygon(lon, lat, island_polygon):
-                continue
-
-            ok = True
-            for p_lat, p_lon in points:
-                if ((lat - p_lat) ** 2 + (lon - p_lon) ** 2) < (current_min_dist ** 2):
-                    ok = False
-                    break
-
-            if ok:
-                points.append((round(lat, 6), round(lon, 6)))
-                if len(points) >= count:
-                    break
-
-        if len(points) == added_before:
-            current_min_dist *= 0.9
-
-        if current_min_dist < 0.003:
-            raise RuntimeError(f"Unable to place {count} dispersed points in zone {zone_bbox}")
-
-    return points
-
+from cluster_config import CLUSTER_LAYOUT
 
-def generate_turbines():
-    """
-    Generate 400 wind turbines distributed across 7 clusters with geographic distribution.
-    """
 
-    # Rough coastline polygon of Zealand (lon, lat), used as land mask.
-    zealand_polygon = [
+# Rough coastline polygon of Zealand (lon, lat), used as land mask. Stored as
+# float64 vertex columns for the vectorized ray-cast.
+ZEALAND_POLYGON = np.asarray(
+    [
         (11.18, 55.67),
         (11.28, 55.95),
         (11.55, 56.10),
@@ -84,83 +29,178 @@ def generate_turbines():
         (11.54, 55.13),
         (11.38, 55.34),
         (11.23, 55.53),
-    ]
+    ],
+    dtype=np.float64,
+)
+_POLY_X = ZEALAND_POLYGON[:, 0].copy()
+_POLY_Y = ZEALAND_POLYGON[:, 1].copy()
 
-    random.seed(42)
-
-    # Cluster distributions and sampling zones (lon_min, lon_max, lat_min, lat_max).
-    clusters_config = {
-        0: {
-            "count": 49,
-            "name": "Zealand North",
-            "zone": (11.78, 12.67, 55.78, 56.20),
-            "min_dist": 0.018,
-        },
-        1: {
-            "count": 12,
-            "name": "Zealand Northeast",
-            "zone": (12.35, 12.80, 55.72, 56.03),
-            "min_dist": 0.03,
-        },
-        2: {
-            "count": 4,
-            "name": "Zealand East",
-            "zone": (12.18, 12.65, 55.43, 55.73),
-            "min_dist": 0.04,
-        },
-        3: {
-            "count": 246,
-            "name": "Zealand Central",
-            "zone": (11.45, 12.60, 55.08, 55.86),
-            "min_dist": 0.012,
-        },
-        4: {
-            "count": 74,
-            "name": "Zealand West",
-            "zone": (11.20, 11.95, 55.20, 55.95),
-            "min_dist": 0.017,
-        },
-        5: {
-            "count": 6,
-            "name": "Zealand Southwest",
-            "zone": (11.60, 12.05, 54.95, 55.30),
-            "min_dist": 0.035,
-        },
-        6: {
-            "count": 9,
-            "name": "Zealand South",
-            "zone": (11.78, 12.35, 54.88, 55.20),
-            "min_dist": 0.03,
-        },
-    }
 
-    turbines = []
-    turbine_id = 0
+def points_in_polygon(lons, lats, poly_x, poly_y):
+    """Vectorized ray-casting point-in-polygon test over arrays of points."""
+    xj, yj = np.roll(poly_x, 1), np.roll(poly_y, 1)
 
-    # Generate turbines for each cluster
-    for cluster_id in range(7):
-        config = clusters_config[cluster_id]
-        count = config["count"]
-        points = sample_distributed_points(
-            count=count,
-            island_polygon=zealand_polygon,
-            zone_bbox=config["zone"],
-            min_dist=config["min_dist"],
+    lons = lons[:, None]
+    lats = lats[:, None]
+    intersects = (poly_y > lats) != (yj > lats)
+    x_int = (xj - poly_x) * (lats - poly_y) / ((yj - poly_y) + 1e-12) + poly_x
+    return np.logical_xor.reduce(intersects & (lons < x_int), axis=1)
+
+
+def accept_candidates(lats, lons, points, n_points, count, grid, lat_min, lon_min, cell, min_dist_sq):
+    """
+    Greedily accept land-masked candidates that keep the minimum spacing.
+    Accepted points are written into the preallocated points array and their
+    index into the background grid. Returns the new number of points.
+    """
+    n_rows, n_cols = grid.shape
+    for k in range(lats.shape[0]):
+        lat = lats[k]
+        lon = lons[k]
+        row = int((lat - lat_min) / cell)
+        col = int((lon - lon_min) / cell)
+
+        ok = True
+        for r in range(max(row - 2, 0), min(row + 3, n_rows)):
+            for c in range(max(col - 2, 0), min(col + 3, n_cols)):
+                idx = grid[r, c]
+                if idx >= 0:
+                    d_lat = lat - points[idx, 0]
+                    d_lon = lon - points[idx, 1]
+                    if d_lat * d_lat + d_lon * d_lon < min_dist_sq:
+                        ok = False
+                        break
+            if not ok:
+                break
+
+        if ok:
+            lat = round(lat, 6)
+            lon = round(lon, 6)
+            points[n_points, 0] = lat
+            points[n_points, 1] = lon
+            grid[int((lat - lat_min) / cell), int((lon - lon_min) / cell)] = n_points
+            n_points += 1
+            if n_points >= count:
+                break
+
+    return n_points
+
+
+def build_point_grid(points, zone_bbox, cell):
+    """Background grid of point indices (-1 for empty) covering the zone."""
+    lon_min, lon_max, lat_min, lat_max = zone_bbox
+    shape = (int((lat_max - lat_min) / cell) + 2, int((lon_max - lon_min) / cell) + 2)
+    grid = np.full(shape, -1, dtype=np.int64)
+    rows = ((points[:, 0] - lat_min) / cell).astype(np.int64)
+    cols = ((points[:, 1] - lon_min) / cell).astype(np.int64)
+    grid[rows, cols] = np.arange(len(points))
+    return grid
+
+
+def sample_distributed_points(count, poly_x, poly_y, zone_bbox, min_dist, rng, batch_size=12000, oversample=2):
+    """
+    Sample points with minimum spacing inside a cluster zone and island polygon.
+    Candidates are drawn and land-masked in batches, then checked against a
+    Bridson-style background grid of cell size min_dist/sqrt(2): each cell holds
+    at most one point, so only the surrounding 5x5 cells need to be inspected.
+    Each batch is sized from the points still needed and the acceptance rate
+    seen so far, capped at batch_size.
+    Falls back by gradually reducing min_dist if batch_size candidates in a row
+    add no point.
+    """
+    lon_min, lon_max, lat_min, lat_max = zone_bbox
+    points = np.empty((count, 2), dtype=np.float64)
+    n_points = 0
+    current_min_dist = min_dist
+    cell = current_min_dist / math.sqrt(2)
+    grid = build_point_grid(points[:0], zone_bbox, cell)
+
+    # Candidates drawn and points accepted at the current min_dist, and
+    # candidates drawn since a batch last added a point
+    n_drawn = 0
+    n_accepted = 0
+    n_stalled = 0
+
+    while n_points < count:
+        added_before = n_points
+
+        accept_rate = (n_accepted + 1) / (n_drawn + 1)
+        size = min(batch_size, math.ceil((count - n_points) / accept_rate) * oversample)
+        lats = rng.uniform(lat_min, lat_max, size=size)
+        lons = rng.uniform(lon_min, lon_max, size=size)
+        inside = points_in_polygon(lons, lats, poly_x, poly_y)
+
+        n_points = accept_candidates(
+            lats[inside], lons[inside], points, n_points, count,
+            grid, lat_min, lon_min, cell, current_min_dist ** 2,
         )
+        n_drawn += size
+        n_accepted += n_points - added_before
+
+        if n_points > added_before:
+            n_stalled = 0
+        else:
+            n_stalled += size
+            if n_stalled >= batch_size:
+                current_min_dist *= 0.9
+                cell = current_min_dist / math.sqrt(2)
+                grid = build_point_grid(points[:n_points], zone_bbox, cell)
+                n_drawn = n_accepted = n_stalled = 0
+
+        if current_min_dist < 0.003:
+            raise RuntimeError(f"Unable to place {count} dispersed points in zone {zone_bbox}")
+
+    return [tuple(p) for p in points.tolist()]
+
+
+def generate_cluster(config, rng):
+    """Sample (lat, lon, capacity) sites for one cluster from its own random stream."""
+    points = sample_distributed_points(
+        count=config["count"],
+        poly_x=_POLY_X,
+        poly_y=_POLY_Y,
+        zone_bbox=config["zone"],
+        min_dist=config["min_dist"],
+        rng=rng,
+    )
+    capacities = np.round(rng.uniform(2.0, 4.5, size=config["count"]), 2).tolist()
+    return [(lat, lon, capacity) for (lat, lon), capacity in zip(points, capacities)]
+
+
+def generate_turbines():
+    """
+    Generate 400 wind turbines distributed across 7 clusters with geographic distribution.
+    Clusters are independent, so each is sampled from its own spawned random
+    stream; a cluster's sites do not depend on the order clusters are sampled in.
+    """
+
+    cluster_ids = sorted(CLUSTER_LAYOUT)
+    # One child stream per cluster, plus one for the final shuffle
+    streams = [np.random.default_rng(s) for s in np.random.SeedSequence(42).spawn(len(cluster_ids) + 1)]
+
+    # Generate turbines for each cluster
+    cluster_sites = [
+        generate_cluster(CLUSTER_LAYOUT[cluster_id], rng)
+        for cluster_id, rng in zip(cluster_ids, streams[:-1])
+    ]
+
+    turbines = []
+    turbine_id = 0
 
-        for lat, lon in points:
+    for cluster_id, sites in zip(cluster_ids, cluster_sites):
+        for lat, lon, capacity in sites:
             turbine = {
                 "turbineId": f"T{turbine_id:03d}",
                 "clusterId": cluster_id,
                 "latitude": lat,
                 "longitude": lon,
-                "capacity": round(random.uniform(2.0, 4.5), 2),
+                "capacity": capacity,
             }
             turbines.append(turbine)
             turbine_id += 1
 
     # Shuffle turbines to mix clusters
-    random.shuffle(turbines)
+    streams[-1].shuffle(turbines)
 
     # Create output directory if not exists
     output_dir = os.path.join(os.path.dirname(__file__), "..", "data")
@@ -170,8 +210,8 @@ def generate_turbines():
     metadata = {
         "generated_at": datetime.now().isoformat(),
         "total_turbines": len(turbines),
-        "cluster_distribution": {str(i): clusters_config[i]["count"] for i in range(7)},
-        "regions": {str(i): clusters_config[i]["name"] for i in range(7)},
+        "cluster_distribution": {str(i): CLUSTER_LAYOUT[i]["count"] for i in sorted(CLUSTER_LAYOUT)},
+        "regions": {str(i): CLUSTER_LAYOUT[i]["name"] for i in sorted(CLUSTER_LAYOUT)},
         "capacity_range_mw": [2.0, 4.5],
     }
 
@@ -180,15 +220,15 @@ def generate_turbines():
 
     # Save to JSON file
     output_path = os.path.join(output_dir, "turbines.json")
-    with open(output_path, "w") as f:
-        json.dump(output_data, f, indent=2)
+    with open(output_path, "wb") as f:
+        f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
 
     print(f"✓ Generated {len(turbines)} turbines")
     print(f"✓ Saved to: {output_path}")
     print(f"\nCluster Distribution:")
-    for cluster_id in range(7):
-        count = clusters_config[cluster_id]["count"]
-        name = clusters_config[cluster_id]["name"]
+    for cluster_id in sorted(CLUSTER_LAYOUT):
+        count = CLUSTER_LAYOUT[cluster_id]["count"]
+        name = CLUSTER_LAYOUT[cluster_id]["name"]
         print(f"  Cluster {cluster_id} ({name}): {count} turbines")
 
 if __name__ == "__main__":
@@ -2,6 +2,8 @@
 PyTorch LSTM model definition and loading utilities.
 """
 import os
+import threading
+from functools import cached_property
 from typing import Dict, Any, Tuple
 
 import torch
@@ -17,13 +19,14 @@ class MinMaxScaler:
     def __init__(self, scale: np.ndarray, min_: np.ndarray):
         """
         Initialize scaler with parameters from sklearn's MinMaxScaler.
+        Parameters are stored as float32 to match the LSTM input dtype.
         
         Args:
             scale: Scale factor array
             min_: Minimum offset array
         """
-        self.scale_ = scale
-        self.min_ = min_
+        self.scale_ = scale.astype(np.float32, copy=False)
+        self.min_ = min_.astype(np.float32, copy=False)
     
     def transform(self, X: np.ndarray) -> np.ndarray:
         """Transform features by scaling to [0,1] range."""
@@ -32,6 +35,12 @@ class MinMaxScaler:
     def inverse_transform(self, X: np.ndarray) -> np.ndarray:
         """Inverse transform to original scale."""
         return (X - self.min_) / self.scale_
+    
+    @cached_property
+    def inverse_affine(self) -> Tuple[float, float]:
+        """(slope, intercept) of inverse_transform for the first feature, as Python floats."""
+        scale = float(self.scale_[0])
+        return 1.0 / scale, -float(self.min_[0]) / scale
 
 
 class SimpleLSTM(nn.Module):
@@ -73,6 +82,46 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
 AVAILABLE_CLUSTERS = {0, 2, 3, 4, 5, 6}  # Cluster 1 model file not available
+SEQ_LEN = 24  # Hours of history per model input window
+# Opt-in int8 dynamic quantization of the LSTM and output layer
+QUANTIZE_MODELS = os.environ.get("QUANTIZE_MODELS", "0") == "1"
+
+# Requests are served concurrently by FastAPI's threadpool; one intra-op
+# thread per inference avoids oversubscribing the CPU.
+torch.set_num_threads(1)
+
+# torch.jit.trace is not thread-safe; models may be loaded from several threads.
+_trace_lock = threading.Lock()
+
+
+# SimpleLSTM state_dict key -> dataset name under 'model_weights' in the HDF5 file
+_WEIGHT_NAMES = {
+    'lstm.weight_ih_l0': 'lstm.weight_ih_l0',
+    'lstm.weight_hh_l0': 'lstm.weight_hh_l0',
+    'lstm.bias_ih_l0': 'lstm.bias_ih_l0',
+    'lstm.bias_hh_l0': 'lstm.bias_hh_l0',
+    # Model uses MLP_layers.0 for output
+    'fc.weight': 'MLP_layers.0.weight',
+    'fc.bias': 'MLP_layers.0.bias',
+}
+
+
+def _read_dataset(ds: h5py.Dataset) -> np.ndarray:
+    """Read an HDF5 dataset with a single read into a preallocated buffer."""
+    buf = np.empty(ds.shape, dtype=ds.dtype)
+    ds.read_direct(buf)
+    return buf
+
+
+def _read_scalers(group: h5py.Group) -> Dict[str, MinMaxScaler]:
+    """Build per-turbine scalers from an HDF5 group of {turbine_id: {scale_, min_}}."""
+    return {
+        turbine_id: MinMaxScaler(
+            scale=_read_dataset(scaler_data['scale_']),
+            min_=_read_dataset(scaler_data['min_']),
+        )
+        for turbine_id, scaler_data in group.items()
+    }
 
 
 def get_model(cluster_id: int) -> Tuple[Any, Dict[str, MinMaxScaler], Dict[str, MinMaxScaler]]:
@@ -84,7 +133,7 @@ def get_model(cluster_id: int) -> Tuple[Any, Dict[str, MinMaxScaler], Dict[str,
         
     Returns:
         Tuple of (model, x_scalers, y_scalers) where:
-        - model: Loaded PyTorch model in evaluation mode
+        - model: Frozen TorchScript model in evaluation mode
         - x_scalers: Dict mapping turbine_id to input feature scaler
         - y_scalers: Dict mapping turbine_id to output scaler
         
@@ -106,44 +155,30 @@ def get_model(cluster_id: int) -> Tuple[Any, Dict[str, MinMaxScaler], Dict[str,
         # Create model instance
         model = SimpleLSTM(input_size=9, hidden_size=128, num_layers=1, output_size=3)
         
-        # Load from HDF5 format (trained model)
-        with h5py.File(model_path, 'r') as f:
-            state_dict = {}
+        # Load from HDF5 format (trained model). The core driver reads the whole
+        # file into memory on open, so the dataset reads below hit RAM only.
+        with h5py.File(model_path, 'r', driver='core', backing_store=False) as f:
             model_weights = f['model_weights']
-            
-            # Load LSTM weights
-            state_dict['lstm.weight_ih_l0'] = torch.from_numpy(model_weights['lstm.weight_ih_l0'][:])
-            state_dict['lstm.weight_hh_l0'] = torch.from_numpy(model_weights['lstm.weight_hh_l0'][:])
-            state_dict['lstm.bias_ih_l0'] = torch.from_numpy(model_weights['lstm.bias_ih_l0'][:])
-            state_dict['lstm.bias_hh_l0'] = torch.from_numpy(model_weights['lstm.bias_hh_l0'][:])
-            
-            # Load MLP output layer weights
-            state_dict['fc.weight'] = torch.from_numpy(model_weights['MLP_layers.0.weight'][:])
-            state_dict['fc.bias'] = torch.from_numpy(model_weights['MLP_layers.0.bias'][:])
-            
+            state_dict = {
+                key: torch.from_numpy(_read_dataset(model_weights[name]))
+                for key, name in _WEIGHT_NAMES.items()
+            }
             model.load_state_dict(state_dict)
             
             # Load x_scaler and y_scaler for each turbine
-            x_scalers = {}
-            y_scalers = {}
-            
-            if 'x_scaler' in f:
-                for turbine_id in f['x_scaler'].keys():
-                    scaler_data = f['x_scaler'][turbine_id]
-                    x_scalers[turbine_id] = MinMaxScaler(
-                        scale=scaler_data['scale_'][:],
-                        min_=scaler_data['min_'][:]
-                    )
-            
-            if 'y_scaler' in f:
-                for turbine_id in f['y_scaler'].keys():
-                    scaler_data = f['y_scaler'][turbine_id]
-                    y_scalers[turbine_id] = MinMaxScaler(
-                        scale=scaler_data['scale_'][:],
-                        min_=scaler_data['min_'][:]
-                    )
+            x_scalers = _read_scalers(f['x_scaler']) if 'x_scaler' in f else {}
+            y_scalers = _read_scalers(f['y_scaler']) if 'y_scaler' in f else {}
         
         model.eval()
+        if QUANTIZE_MODELS:
+            # Scalers are applied in FP32 outside the model, so only the matmuls go int8
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {nn.LSTM, nn.Linear}, dtype=torch.qint8
+            )
+        # Trace once so every request reuses the TorchScript graph, then freeze it
+        # so weights are inlined as constants instead of looked up per forward
+        with _trace_lock:
+            model = torch.jit.freeze(torch.jit.trace(model, torch.zeros(1, SEQ_LEN, 9)))
         _models[cluster_id] = (model, x_scalers, y_scalers)
         return model, x_scalers, y_scalers
         
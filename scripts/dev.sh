@@ -13,7 +13,7 @@ trap cleanup EXIT INT TERM
   [[ -d .venv ]] || python3 -m venv .venv
   source .venv/bin/activate
   pip install -r requirements.txt >/dev/null
-  exec uvicorn main:app --reload --port 8000
+  exec uvicorn main:app --reload --port 8000 --loop uvloop --http httptools
 ) &
 PY_PID=$!
 